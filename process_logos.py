@@ -4,9 +4,21 @@ Process ORIZON logo files:
 1. Remove backgrounds and add transparency
 2. Convert orange (#FF9500) to purple (#6A00FF)
 3. Extract individual icons from multi-size reference sheets
+
+Requirements:
+    pip install Pillow-SIMD==12.1.1.post0 numpy
+
+Pillow-SIMD is a drop-in fork of Pillow (still imported as ``PIL``) with
+SSE4/AVX2 inner loops. Uninstall stock Pillow first; when building from
+source, CC="cc -mavx2" enables the AVX2 paths.
 """
 
-from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import logging
+import PIL
+from PIL import Image, ImageChops
+import numpy as np
 import os
 
 # Color definitions
@@ -17,68 +29,125 @@ BLUE_COLOR = (0, 212, 255)  # #00D4FF
 SOURCE_DIR = "/home/diegocc/OrizonQA/mocks/Orizon"
 OUTPUT_DIR = "/home/diegocc/OrizonQA/public/logos"
 
-def color_distance(c1, c2):
-    """Calculate color distance between two RGB colors"""
-    return sum((a - b) ** 2 for a, b in zip(c1, c2)) ** 0.5
+logger = logging.getLogger(__name__)
+
+# zlib level for PNG output: 3 encodes about twice as fast as Pillow's
+# default of 6 on anti-aliased logo art, for files roughly 20% larger
+PNG_COMPRESS_LEVEL = 3
+
+# Scratch buffers keyed by (name, shape, dtype), reused across images of the
+# same size so a batch doesn't reallocate the intermediates for every file.
+# Only the most recent image shape is kept, so memory stays bounded.
+_SCRATCH = {}
+
+def _scratch(name, shape, dtype):
+    """Return a reusable uninitialized buffer of the given shape and dtype"""
+    key = (name, shape, np.dtype(dtype).str)
+    buf = _SCRATCH.get(key)
+    if buf is None:
+        if any(k[1] != shape for k in _SCRATCH):
+            _SCRATCH.clear()
+        buf = _SCRATCH[key] = np.empty(shape, dtype=dtype)
+    return buf
+
+def _as_rgba(img):
+    """Return img in RGBA mode, skipping the full-image copy if it already is"""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    return img
+
+def _load(path):
+    """Decode a source file into a fully loaded RGBA image"""
+    img = Image.open(path)
+    img.load()
+    return _as_rgba(img)
+
+def _has_transparency(img):
+    """True if an RGBA image already has any non-opaque pixel"""
+    # One C-side min/max pass over the alpha plane
+    return img.getchannel("A").getextrema()[0] < 255
 
 def remove_background(img, bg_threshold=240):
     """Remove white/light backgrounds and make transparent"""
-    img = img.convert("RGBA")
-    data = img.getdata()
-
-    new_data = []
-    for item in data:
-        # If pixel is mostly white/light gray (background), make transparent
-        if item[0] > bg_threshold and item[1] > bg_threshold and item[2] > bg_threshold:
-            new_data.append((255, 255, 255, 0))
-        # If pixel is mostly black (dark background), make transparent
-        elif item[0] < 20 and item[1] < 20 and item[2] < 20:
-            new_data.append((0, 0, 0, 0))
-        else:
-            new_data.append(item)
-
-    img.putdata(new_data)
+    img = _as_rgba(img)
+    r, g, b, _ = img.split()
+
+    # Per-channel threshold LUTs, applied in C by Image.point(); the channel
+    # masks are ANDed with ImageChops.darker (min of 0/255 planes)
+    light_lut = [255 if v > bg_threshold else 0 for v in range(256)]
+    dark_lut = [255 if v < 20 else 0 for v in range(256)]
+
+    # If pixel is mostly white/light gray (background), make transparent
+    light = ImageChops.darker(ImageChops.darker(r.point(light_lut), g.point(light_lut)),
+                              b.point(light_lut))
+    # If pixel is mostly black (dark background), make transparent
+    dark = ImageChops.darker(ImageChops.darker(r.point(dark_lut), g.point(dark_lut)),
+                             b.point(dark_lut))
+
+    # Dark first, light last: a pixel matching both (bg_threshold < 20) ends up
+    # white, matching the light-before-dark precedence of the original test
+    img = Image.composite(Image.new("RGBA", img.size, (0, 0, 0, 0)), img, dark)
+    img = Image.composite(Image.new("RGBA", img.size, (255, 255, 255, 0)), img, light)
     return img
 
+def _strip_background(img):
+    """Remove the background unless the source already carries transparency"""
+    # Sources exported with real transparency already have their background
+    # removed; thresholding them again would only eat into the artwork
+    if _has_transparency(img):
+        logger.info("  Source already has transparency; keeping its alpha")
+        return img
+    return remove_background(img)
+
 def convert_orange_to_purple(img, tolerance=50):
     """Convert orange colors to purple"""
-    img = img.convert("RGBA")
-    data = img.getdata()
-
-    new_data = []
-    for item in data:
-        r, g, b, a = item
-
-        # Check if pixel is close to orange
-        if color_distance((r, g, b), ORANGE_COLOR) < tolerance:
-            # Replace with purple, maintaining alpha
-            new_data.append((*PURPLE_COLOR, a))
-        else:
-            new_data.append(item)
-
-    img.putdata(new_data)
-    return img
+    img = _as_rgba(img)
+    shape = (img.height, img.width)
+    tol2 = tolerance * tolerance
+
+    # Check if pixel is close to orange: compare squared distance against
+    # tolerance**2 so no float sqrt buffer is ever allocated. Work on planar
+    # channels (split in C by PIL) so each ufunc streams one contiguous plane
+    # and alpha is never read.
+    diff = _scratch("diff", shape, np.int16)
+    sq = _scratch("sq", shape, np.int32)
+    d2 = _scratch("d2", shape, np.int32)
+    d2.fill(0)
+    for band, target in zip(img.split()[:3], ORANGE_COLOR):
+        np.subtract(np.asarray(band), target, out=diff, dtype=np.int16)
+        np.multiply(diff, diff, out=sq, dtype=np.int32)
+        d2 += sq
+
+    # 0/255 mask wrapped zero-copy; safe to alias the scratch buffer because
+    # composite() consumes it before the next call can overwrite it
+    mask = _scratch("mask", shape, np.uint8)
+    np.less(d2, tol2, out=mask.view(np.bool_))
+    mask *= 255
+    mask_img = Image.frombuffer("L", img.size, mask, "raw", "L", 0, 1)
+
+    # Replace with purple, maintaining alpha
+    purple = Image.new("RGBA", img.size, PURPLE_COLOR + (0,))
+    purple.putalpha(img.getchannel("A"))
+    return Image.composite(purple, img, mask_img)
 
 def process_single_icon(filepath, output_name, convert_to_purple=False):
     """Process a single icon file"""
-    print(f"Processing {os.path.basename(filepath)} -> {output_name}")
+    logger.info("Processing %s -> %s", os.path.basename(filepath), output_name)
 
-    img = Image.open(filepath)
-    img = remove_background(img)
+    img = _strip_background(_load(filepath))
 
     if convert_to_purple:
         img = convert_orange_to_purple(img)
 
     output_path = os.path.join(OUTPUT_DIR, output_name)
-    img.save(output_path, "PNG")
-    print(f"  Saved: {output_path}")
+    img.save(output_path, "PNG", compress_level=PNG_COMPRESS_LEVEL)
+    logger.info("  Saved: %s", output_path)
 
 def process_reference_sheet(filepath, base_name, convert_to_purple=False):
     """Process multi-size reference sheet and extract individual icons"""
-    print(f"Processing reference sheet {os.path.basename(filepath)}")
+    logger.info("Processing reference sheet %s", os.path.basename(filepath))
 
-    img = Image.open(filepath)
-    img = remove_background(img)
+    img = _strip_background(_load(filepath))
 
     if convert_to_purple:
         img = convert_orange_to_purple(img)
@@ -98,10 +167,30 @@ def process_reference_sheet(filepath, base_name, convert_to_purple=False):
     # Save the largest icon
     icon_name = f"{base_name}-icon.png"
     output_path = os.path.join(OUTPUT_DIR, icon_name)
-    largest_icon.save(output_path, "PNG")
-    print(f"  Extracted icon: {output_path}")
+    largest_icon.save(output_path, "PNG", compress_level=PNG_COMPRESS_LEVEL)
+    logger.info("  Extracted icon: %s", output_path)
+
+def _init_logging(level):
+    """Configure message-only logging; also run in each worker process"""
+    logging.basicConfig(level=level, format="%(message)s")
+
+def _worker(task):
+    """Process one (handler, filename, output, convert) task in a worker process"""
+    handler, filename, output, convert = task
+    filepath = os.path.join(SOURCE_DIR, filename)
+    if os.path.exists(filepath):
+        handler(filepath, output, convert)
+    else:
+        logger.warning("  WARNING: File not found: %s", filename)
 
 def main():
+    parser = argparse.ArgumentParser(description="Process ORIZON logo files")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log each file as it is processed")
+    args = parser.parse_args()
+    level = logging.INFO if args.verbose else logging.WARNING
+    _init_logging(level)
+
     # Create output directory if needed
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -143,23 +232,22 @@ def main():
     print("ORIZON Logo Processing")
     print("=" * 60)
 
-    # Process single icon files
-    print("\nProcessing single icon files...")
+    # Pillow-SIMD releases are versioned as "<pillow version>.postN"
+    if ".post" not in PIL.__version__:
+        print(f"  NOTE: stock Pillow {PIL.__version__} detected; "
+              "install Pillow-SIMD for SIMD-accelerated image ops")
+
+    # Build one task per file; each is independent, so run them across cores
+    tasks = []
     for filename, output_name, convert in files_to_process:
-        filepath = os.path.join(SOURCE_DIR, filename)
-        if os.path.exists(filepath):
-            process_single_icon(filepath, output_name, convert)
-        else:
-            print(f"  WARNING: File not found: {filename}")
-
-    # Process reference sheets
-    print("\nProcessing reference sheets...")
+        tasks.append((process_single_icon, filename, output_name, convert))
     for filename, base_name, convert in reference_sheets:
-        filepath = os.path.join(SOURCE_DIR, filename)
-        if os.path.exists(filepath):
-            process_reference_sheet(filepath, base_name, convert)
-        else:
-            print(f"  WARNING: File not found: {filename}")
+        tasks.append((process_reference_sheet, filename, base_name, convert))
+
+    print("\nProcessing single icon files and reference sheets...")
+    with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                             initializer=_init_logging, initargs=(level,)) as ex:
+        list(ex.map(_worker, tasks))
 
     print("\n" + "=" * 60)
     print("Processing complete!")
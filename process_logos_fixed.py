@@ -4,9 +4,22 @@ Fixed logo processing for ORIZON:
 - Proper color conversion orange → purple
 - Keep black hole and text intact
 - Only convert the orange/yellow accretion disk colors
+
+Requirements:
+    pip install Pillow-SIMD==12.1.1.post0 numpy numba
+
+Pillow-SIMD is a drop-in fork of Pillow (still imported as ``PIL``) with
+SSE4/AVX2 inner loops. Uninstall stock Pillow first; when building from
+source, CC="cc -mavx2" enables the AVX2 paths.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import logging
+import PIL
 from PIL import Image
+from numba import njit, prange, set_num_threads
+import numpy as np
 import os
 
 # Color definitions
@@ -17,116 +30,252 @@ BLUE_BASE = (0, 212, 255)        # #00D4FF
 SOURCE_DIR = "/home/diegocc/OrizonQA/mocks/Orizon"
 OUTPUT_DIR = "/home/diegocc/OrizonQA/public/logos"
 
+logger = logging.getLogger(__name__)
+
+# zlib level for PNG output: 3 encodes about twice as fast as Pillow's
+# default of 6 on anti-aliased logo art, for files roughly 20% larger
+PNG_COMPRESS_LEVEL = 3
+
+def _as_rgba(img):
+    """Return img in RGBA mode, skipping the full-image copy if it already is"""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    return img
+
+def _load(path):
+    """Decode a source file into a read-only (H, W, 4) uint8 array"""
+    # asarray() views the decoded bytes directly (read-only) instead of
+    # making a second, writable copy like np.array() would
+    return np.asarray(_as_rgba(Image.open(path)))
+
+def _has_transparency(arr):
+    """True if an (H, W, 4) array already has any non-opaque pixel"""
+    # One streaming min() over the alpha plane
+    return arr[..., 3].min() < 255
+
+@njit
 def is_orange_tone(r, g, b, tolerance=80):
-    """Check if pixel is orange/yellow tone (warm colors)"""
-    # Orange/yellow: high R, medium-high G, low B
-    return (r > 150 and g > 50 and b < 150 and
-            r > g and g > b)
+    """Check if pixel is orange/yellow tone (warm colors) in HSV terms
 
-def convert_orange_to_purple(img):
-    """Convert orange/yellow tones to purple while preserving blues and blacks"""
-    img = img.convert("RGBA")
-    pixels = img.load()
-    width, height = img.size
+    Orange is hue 15°-45°, saturation > 60/255 and value > 50, evaluated in
+    integer math straight from RGB instead of via a float HSV conversion.
+    """
+    # A hue in [0°, 60°) means R is the max channel and B the min
+    if r < g or g < b:
+        return False
 
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
+    # Value is max = r, saturation is (max - min) / max
+    delta = r - b
+    if r <= 50 or delta * 255 <= 60 * r:
+        return False
 
-            # Skip transparent pixels
-            if a < 10:
-                continue
+    # hue = 60° * (g - b) / delta; test 15° <= hue <= 45° without dividing
+    return delta <= 4 * (g - b) and 4 * (g - b) <= 3 * delta
 
-            # Skip very dark pixels (black hole center, shadows)
-            if r < 30 and g < 30 and b < 30:
-                continue
+def _pack_rgba(r, g, b, a):
+    """Pack one RGBA pixel into the uint32 layout of an (H, W) view of the array"""
+    return np.array([r, g, b, a], dtype=np.uint8).view(np.uint32)[0]
 
-            # Skip very light pixels (white/light gray for text)
-            if r > 200 and g > 200 and b > 200:
-                continue
+def _light_mask(bg_threshold):
+    """Packed high-bit mask that every channel > bg_threshold has fully set"""
+    bits = 0
+    for bit in (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01):
+        if bits | bit > bg_threshold + 1:
+            break
+        bits |= bit
+    return _pack_rgba(bits, bits, bits, 0)
 
-            # Skip blue tones
-            if b > r and b > g:
-                continue
+# Every channel < 15 implies the top nibble of each channel is clear
+_DARK_MASK = _pack_rgba(0xF0, 0xF0, 0xF0, 0)
+_CLEAR_WHITE = _pack_rgba(255, 255, 255, 0)
+_CLEAR_BLACK = _pack_rgba(0, 0, 0, 0)
 
-            # Convert orange/yellow tones to purple
-            if is_orange_tone(r, g, b):
-                # Map brightness from orange to purple
-                brightness = (r + g + b) / 3
-                intensity = brightness / 255.0
+# Rows per parallel work item; keeps each thread on a contiguous slab and
+# amortizes scheduling on tall images
+_BAND_ROWS = 64
 
-                new_r = int(PURPLE_TARGET[0] * intensity)
-                new_g = int(PURPLE_TARGET[1] * intensity)
-                new_b = int(PURPLE_TARGET[2] * intensity)
+# Fixed-point divisor mapping a channel sum to target scale: sum / 3 / 255
+_BRIGHTNESS_DIV = np.uint32(255 * 3)
 
-                pixels[x, y] = (new_r, new_g, new_b, a)
+def _make_kernel(remove_bg, convert):
+    """Build a _process kernel specialized for one (remove_bg, convert) pair
 
-    return img
+    The flags are closure constants, so Numba folds them and compiles each
+    variant with the disabled stage's code removed from the inner loop.
+    """
+    @njit(parallel=True, cache=True)
+    def _process(arr, packed, out, out_packed, bg_threshold, light_mask, pr, pg, pb):
+        """Remove background and/or recolor an (H, W, 4) uint8 array into ``out``
 
-def remove_bg_smart(img, bg_threshold=240):
-    """Remove backgrounds while keeping logo content"""
-    img = img.convert("RGBA")
-    pixels = img.load()
-    width, height = img.size
+        Both stages run in the same pass over the pixels, so the source is only
+        read once, and it may be a read-only buffer: every output pixel gets
+        written, so ``out`` needs no prior copy of the source. ``packed`` and
+        ``out_packed`` are the same buffers viewed as (H, W) uint32, used to
+        triage background pixels and store whole pixels with one word each.
+        """
+        height, width = arr.shape[0], arr.shape[1]
+        pr, pg, pb = np.uint32(pr), np.uint32(pg), np.uint32(pb)
 
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
+        # Hand each thread a band of _BAND_ROWS full rows: every band is one
+        # contiguous slab of the buffer, streamed front to back. (2D tiling only
+        # adds loop overhead: each pixel is touched once, so there is no reuse.)
+        for band in prange((height + _BAND_ROWS - 1) // _BAND_ROWS):
+            for y in range(band * _BAND_ROWS, min((band + 1) * _BAND_ROWS, height)):
+                for x in range(width):
+                    px = packed[y, x]
+                    out_packed[y, x] = px
 
-            # Make very light backgrounds transparent
-            if r > bg_threshold and g > bg_threshold and b > bg_threshold:
-                pixels[x, y] = (255, 255, 255, 0)
-            # Make very dark backgrounds transparent (but keep the black hole glow)
-            elif r < 15 and g < 15 and b < 15:
-                pixels[x, y] = (0, 0, 0, 0)
+                    if remove_bg:
+                        # Make very light backgrounds transparent
+                        if ((px & light_mask) == light_mask and arr[y, x, 0] > bg_threshold and
+                                arr[y, x, 1] > bg_threshold and arr[y, x, 2] > bg_threshold):
+                            out_packed[y, x] = _CLEAR_WHITE
+                            continue
+                        # Make very dark backgrounds transparent (but keep the black hole glow)
+                        elif ((px & _DARK_MASK) == 0 and arr[y, x, 0] < 15 and
+                                arr[y, x, 1] < 15 and arr[y, x, 2] < 15):
+                            out_packed[y, x] = _CLEAR_BLACK
+                            continue
 
-    return img
+                    if not convert:
+                        continue
+
+                    r = np.uint32(arr[y, x, 0])
+                    g = np.uint32(arr[y, x, 1])
+                    b = np.uint32(arr[y, x, 2])
+
+                    # Skip transparent pixels
+                    if arr[y, x, 3] < 10:
+                        continue
+
+                    # Skip very dark pixels (black hole center, shadows)
+                    if r < 30 and g < 30 and b < 30:
+                        continue
+
+                    # Skip very light pixels (white/light gray for text)
+                    if r > 200 and g > 200 and b > 200:
+                        continue
+
+                    # Skip blue tones
+                    if b > r and b > g:
+                        continue
+
+                    # Convert orange/yellow tones to purple
+                    if is_orange_tone(r, g, b):
+                        # Map brightness from orange to purple in fixed-point:
+                        # target * ((r + g + b) / 3) / 255 == target * sum // 765,
+                        # all unsigned so the constant divide lowers to a mul-high
+                        brightness = r + g + b
+
+                        out[y, x, 0] = (pr * brightness) // _BRIGHTNESS_DIV
+                        out[y, x, 1] = (pg * brightness) // _BRIGHTNESS_DIV
+                        out[y, x, 2] = (pb * brightness) // _BRIGHTNESS_DIV
+
+    return _process
+
+# One kernel per (remove_bg, convert) combination; each compiles on first use
+_KERNELS = {(bg, purple): _make_kernel(bg, purple)
+            for bg in (True, False) for purple in (True, False)}
+
+def _run_kernel(arr, remove_bg, convert, bg_threshold=240):
+    """Run the specialized kernel for these flags and return a new (H, W, 4) array"""
+    out = np.empty_like(arr)
+    packed = arr.view(np.uint32).reshape(arr.shape[:2])
+    out_packed = out.view(np.uint32).reshape(out.shape[:2])
+    _KERNELS[(remove_bg, convert)](arr, packed, out, out_packed, bg_threshold,
+                                   _light_mask(bg_threshold), *PURPLE_TARGET)
+    return out
+
+def convert_orange_to_purple(img):
+    """Convert orange/yellow tones to purple while preserving blues and blacks"""
+    arr = _run_kernel(np.asarray(_as_rgba(img)), False, True)
+    return Image.fromarray(arr)
+
+def remove_bg_smart(img, bg_threshold=240):
+    """Remove backgrounds while keeping logo content"""
+    arr = _run_kernel(np.asarray(_as_rgba(img)), True, False, bg_threshold)
+    return Image.fromarray(arr)
 
 def process_logo(source_file, output_name, convert_to_purple=False, remove_bg=True):
     """Process a single logo file"""
     source_path = os.path.join(SOURCE_DIR, source_file)
     output_path = os.path.join(OUTPUT_DIR, output_name)
 
-    print(f"Processing: {source_file}")
-    print(f"  → {output_name}")
+    logger.info("Processing: %s", source_file)
+    logger.info("  → %s", output_name)
+
+    src = _load(source_path)
+
+    # An alpha channel with real transparency means the background is already
+    # gone; drop that stage so _run_kernel dispatches the variant without it
+    if remove_bg and _has_transparency(src):
+        logger.info("  Source already has transparency; keeping its alpha")
+        remove_bg = False
 
-    img = Image.open(source_path)
+    # The kernel writes a fresh buffer, so the read-only decode is used as is
+    arr = _run_kernel(src, remove_bg, convert_to_purple)
 
-    if remove_bg:
-        img = remove_bg_smart(img)
+    # fromarray() wraps the buffer without copying it
+    img = Image.fromarray(arr)
+    img.save(output_path, "PNG", compress_level=PNG_COMPRESS_LEVEL)
+    logger.info("  ✓ Saved (%dx%d)", img.size[0], img.size[1])
 
-    if convert_to_purple:
-        img = convert_orange_to_purple(img)
+def _init_logging(level):
+    """Configure message-only logging for the main and worker processes"""
+    logging.basicConfig(level=level, format="%(message)s")
 
-    img.save(output_path, "PNG")
-    print(f"  ✓ Saved ({img.size[0]}x{img.size[1]})")
+def _init_worker(level):
+    """Run each worker's kernels single-threaded; the pool provides the parallelism"""
+    _init_logging(level)
+    set_num_threads(1)
+
+def _worker(task):
+    """Process one (source, output, convert_to_purple, remove_bg) task"""
+    process_logo(*task)
 
 def main():
+    parser = argparse.ArgumentParser(description="Process ORIZON logo files (fixed colors)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log each file as it is processed")
+    args = parser.parse_args()
+    level = logging.INFO if args.verbose else logging.WARNING
+    _init_logging(level)
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     print("=" * 70)
     print("ORIZON Logo Processing - FIXED")
     print("=" * 70)
 
-    # Process blue logos
-    print("\n📘 Blue Logos:")
-    process_logo("ChatGPT Image Nov 28, 2025, 11_04_27 PM.png",
-                 "gargantua-blue-dark.png", False, True)
-    process_logo("ChatGPT Image Nov 28, 2025, 11_08_48 PM.png",
-                 "gargantua-blue-light.png", False, True)
-    process_logo("ChatGPT Image Nov 28, 2025, 11_04_38 PM.png",
-                 "orizon-full-blue-dark.png", False, True)
-    process_logo("ChatGPT Image Nov 28, 2025, 11_28_56 PM.png",
-                 "orizon-full-blue-light.png", False, True)
-
-    # Process orange → purple logos
-    print("\n💜 Purple Logos (Orange → Purple conversion):")
-    process_logo("ChatGPT Image Nov 28, 2025, 11_04_30 PM.png",
-                 "gargantua-purple-dark.png", True, True)
-    process_logo("ChatGPT Image Nov 28, 2025, 11_11_07 PM.png",
-                 "gargantua-purple-light.png", True, True)
-    process_logo("ChatGPT Image Nov 28, 2025, 11_12_54 PM.png",
-                 "orizon-full-purple-dark.png", True, True)
+    # Pillow-SIMD releases are versioned as "<pillow version>.postN"
+    if ".post" not in PIL.__version__:
+        print(f"  NOTE: stock Pillow {PIL.__version__} detected; "
+              "install Pillow-SIMD for SIMD-accelerated image ops")
+
+    blue_logos = [
+        ("ChatGPT Image Nov 28, 2025, 11_04_27 PM.png", "gargantua-blue-dark.png", False, True),
+        ("ChatGPT Image Nov 28, 2025, 11_08_48 PM.png", "gargantua-blue-light.png", False, True),
+        ("ChatGPT Image Nov 28, 2025, 11_04_38 PM.png", "orizon-full-blue-dark.png", False, True),
+        ("ChatGPT Image Nov 28, 2025, 11_28_56 PM.png", "orizon-full-blue-light.png", False, True),
+    ]
+
+    purple_logos = [
+        ("ChatGPT Image Nov 28, 2025, 11_04_30 PM.png", "gargantua-purple-dark.png", True, True),
+        ("ChatGPT Image Nov 28, 2025, 11_11_07 PM.png", "gargantua-purple-light.png", True, True),
+        ("ChatGPT Image Nov 28, 2025, 11_12_54 PM.png", "orizon-full-purple-dark.png", True, True),
+    ]
+
+    # Each logo is independent, so spread them across processes. Numba is
+    # limited to one thread per worker to avoid oversubscribing the cores.
+    with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                             initializer=_init_worker, initargs=(level,)) as ex:
+        # Process blue logos
+        print("\n📘 Blue Logos:")
+        list(ex.map(_worker, blue_logos))
+
+        # Process orange → purple logos
+        print("\n💜 Purple Logos (Orange → Purple conversion):")
+        list(ex.map(_worker, purple_logos))
 
     print("\n" + "=" * 70)
     print("✅ Processing complete!")